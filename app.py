@@ -1,22 +1,31 @@
 import streamlit as st
-from audit_mvp import generate_audit_report, build_pdf
+import requests
+from audit_mvp import generate_audit_report, build_pdf, RUBRIC
 import base64
 import os
 import re
-import tempfile
+import time
 
 st.set_page_config(page_title="Growth Marketing Audit", layout="wide")
 
+_SITE_NAME_RE = re.compile(r"[^\w\-]")
+PROGRESS_INTERVAL = 0.1  # seconds between streamed panel refreshes per section
+
 # ==========================
 # LOAD CUSTOM FONTS
 # ==========================
-def load_font_as_base64(path):
+@st.cache_data(show_spinner=False)
+def load_font_as_base64(path, mtime=None):
+    # mtime is only part of the cache key so an edited font file is re-read
     with open(path, "rb") as f:
         data = f.read()
     return base64.b64encode(data).decode("utf-8")
 
-montserrat_medium_base64 = load_font_as_base64("Montserrat-Medium.ttf")
-montserrat_extrabold_base64 = load_font_as_base64("Montserrat-ExtraBold.ttf")
+MONTSERRAT_MEDIUM = "Montserrat-Medium.ttf"
+MONTSERRAT_EXTRABOLD = "Montserrat-ExtraBold.ttf"
+
+montserrat_medium_base64 = load_font_as_base64(MONTSERRAT_MEDIUM, os.path.getmtime(MONTSERRAT_MEDIUM))
+montserrat_extrabold_base64 = load_font_as_base64(MONTSERRAT_EXTRABOLD, os.path.getmtime(MONTSERRAT_EXTRABOLD))
 
 st.markdown(f"""
     <style>
@@ -58,53 +67,71 @@ if st.button("Generate Audit"):
     if not website_url:
         st.error("Please enter a website URL before generating the audit.")
     else:
-        with st.spinner("Generating your audit report..."):
-            report = generate_audit_report(website_url)
+        # One panel per section so the concurrent streams render side by side
+        panels = {section: st.empty() for section in RUBRIC}
+        last_update = dict.fromkeys(RUBRIC, 0.0)
+
+        def show_progress(section, partial):
+            # Each refresh resends the whole partial, so redraw a panel at most
+            # every PROGRESS_INTERVAL rather than on every token; the finished
+            # section replaces it below either way
+            now = time.monotonic()
+            if now - last_update[section] < PROGRESS_INTERVAL:
+                return
+            last_update[section] = now
+            with panels[section].container():
+                st.subheader(f"{section} – Generating...")
+                st.code(partial, language="json")
+
+        try:
+            report = generate_audit_report(website_url, on_delta=show_progress)
+        except (requests.RequestException, ValueError) as e:
+            # Unreachable/blocked site, or a page with no readable body text
+            st.error(f"⚠️ Could not scrape {website_url}: {e}")
+            st.stop()
 
         if report and isinstance(report, dict):
             st.success("✅ Audit complete!")
             
             for section, details in report.items():
-                if isinstance(details, dict):
-                    st.subheader(f"{section} – Grade: {details.get('grade','N/A')}")
-                    st.write(details.get("reasoning", "No reasoning available."))
-                    if details.get("quick_wins"):
-                        st.markdown("**Quick Wins:**")
-                        for q in details["quick_wins"]:
-                            st.write(f"- {q}")
-                else:
-                    st.subheader(section)
-                    st.write(details)
+                panel = panels.get(section) or st.empty()
+                with panel.container():
+                    if isinstance(details, dict):
+                        st.subheader(f"{section} – Grade: {details.get('grade','N/A')}")
+                        st.write(details.get("reasoning", "No reasoning available."))
+                        if details.get("quick_wins"):
+                            st.markdown("**Quick Wins:**")
+                            for q in details["quick_wins"]:
+                                st.write(f"- {q}")
+                    else:
+                        st.subheader(section)
+                        st.write(details)
 
             # ==========================
             # GENERATE PDF
             # ==========================
             # Clean website URL to create safe file name
-            safe_site_name = re.sub(r"[^\w\-]", "_", website_url.split("//")[-1].split("/")[0])
-            temp_dir = tempfile.gettempdir()
-            pdf_path = os.path.join(temp_dir, f"{safe_site_name}_audit.pdf")
+            safe_site_name = _SITE_NAME_RE.sub("_", website_url.split("//")[-1].split("/")[0])
 
-            # Build the PDF
-            pdf_file = build_pdf(
-                report,
-                pdf_path,
-                header_image="Growth_Marketing_Audit_Header.png",
-                heading_font="Montserrat-ExtraBold.ttf",
-                body_font="Montserrat-Medium.ttf"
-            )
-
-            # Provide download button
-            if os.path.exists(pdf_file):
-                with open(pdf_file, "rb") as f:
-                    pdf_bytes = f.read()
+            # Build the PDF in memory; no temp file round-trip. A render error
+            # raises rather than returning empty bytes
+            try:
+                pdf_bytes = build_pdf(
+                    report,
+                    header_image="Growth_Marketing_Audit_Header.png",
+                    heading_font="Montserrat-ExtraBold.ttf",
+                    body_font="Montserrat-Medium.ttf"
+                )
+            except Exception as e:
+                st.error(f"⚠️ PDF generation failed: {e}")
+            else:
+                # Provide download button
                 st.download_button(
                     label="📄 Download Audit PDF",
                     data=pdf_bytes,
                     file_name=f"{safe_site_name}_audit.pdf",
                     mime="application/pdf"
                 )
-            else:
-                st.error("⚠️ PDF generation failed. Please check your backend function.")
 
         else:
             st.error("⚠️ Audit report is invalid. Please check the backend function.")
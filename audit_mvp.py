@@ -1,15 +1,28 @@
 #!/usr/bin/env python3
 import os
-import json
+import orjson
 import argparse
+import io
+import asyncio
+import hashlib
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import diskcache
+import httpx
 import requests
-from bs4 import BeautifulSoup
-from openai import OpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
+from openai import OpenAI, AsyncOpenAI
 from fpdf import FPDF
-from fpdf.enums import XPos, YPos
+from fpdf.enums import MethodReturnValue, XPos, YPos
 import textwrap
 import re
 from dotenv import load_dotenv
+from pydantic import BaseModel
+from typing import BinaryIO, Literal
+from urllib.parse import urlsplit, urlunsplit
 
 # ==========================
 # LOAD ENV VARIABLES
@@ -21,46 +34,273 @@ if not OPENAI_API_KEY:
 
 client = OpenAI(api_key=OPENAI_API_KEY)
 
+# Shared HTTP session so repeat hosts reuse pooled keep-alive connections
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20,
+                       max_retries=Retry(total=3, backoff_factor=0.3))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+SESSION.headers["User-Agent"] = "GrowthAuditBot/1.0"
+
+# Upper bound on scraped characters sent to the model
+MAX_CHARS = 10000
+
+# Persistent cache for scrapes and audits, shared across runs and users
+CACHE = diskcache.Cache(os.path.expanduser("~/.cache/growth-audit"))
+SCRAPE_TTL = 24 * 60 * 60      # 1 day
+AUDIT_TTL = 7 * 24 * 60 * 60   # 7 days
+
+# Sites packed into one prompt in --url-list mode; latency climbs quickly past this
+BATCH_SIZE = 4
+
+# How often --batch mode checks on a submitted OpenAI batch job
+BATCH_POLL_SECONDS = 30
+
+# Concurrent page fetches when scraping a --url-list, and retries per page
+SCRAPE_CONCURRENCY = 20
+SCRAPE_RETRIES = 3
+
+# Cap on pooled connections shared by the concurrent per-section calls
+MAX_CONNECTIONS = 8
+
 # ==========================
 # HELPERS
 # ==========================
-def scrape_website(url):
-    resp = requests.get(url)
-    soup = BeautifulSoup(resp.text, "html.parser")
-    texts = soup.stripped_strings
-    return " ".join(texts)
-
-def build_prompt(text, rubric):
-    # Force GPT to only return JSON
+def _texts(tree, selector):
+    return [t for t in (n.text(separator=" ", strip=True) for n in tree.css(selector)) if t]
+
+def scrape_website(url, max_chars=MAX_CHARS):
+    """
+    Return a structured summary of the page (title, meta, headings, nav, body),
+    capped at max_chars so long homepages don't inflate the prompt.
+    """
+    resp = SESSION.get(url, timeout=(3, 10))
+    resp.raise_for_status()  # don't feed error pages to GPT
+    return extract_text(resp.text, max_chars=max_chars)
+
+def extract_text(html, max_chars=MAX_CHARS):
+    tree = LexborHTMLParser(html)
+    # Unlike stripped_strings, node.text() would include script/style bodies;
+    # footers are boilerplate that would otherwise land in BODY
+    for tag in tree.css("script,style,noscript,footer"):
+        tag.decompose()
+
+    meta = tree.css_first('meta[name="description"]')
+    description = (meta.attributes.get("content") or "").strip() if meta else ""
+    blocks = [
+        ("TITLE", " ".join(_texts(tree, "title"))),
+        ("META", description),
+        ("H1", " | ".join(_texts(tree, "h1"))),
+        ("H2-H3", " | ".join(_texts(tree, "h2, h3"))),
+        ("NAV", " | ".join(_texts(tree, "nav a"))),
+    ]
+
+    # Paragraphs only, so BODY doesn't repeat the heading/nav blocks; prefer
+    # the main content area when the page marks one
+    body = " ".join(_texts(tree, "main p") or _texts(tree, "body p"))
+    if not body:
+        # Builder/SPA pages keep their copy in div/span: take the whole
+        # main/body text once the blocks above have been pulled out of it
+        for tag in tree.css("nav, h1, h2, h3"):
+            tag.decompose()
+        root = tree.css_first("main") or tree.body
+        body = " ".join(root.text(separator=" ").split()) if root else ""
+    if not body:
+        # Grading from the title/nav alone would be guesswork, and get cached
+        raise ValueError("No readable body text on page")
+    blocks.append(("BODY", body))
+
+    text = "\n".join(f"{label}: {value}" for label, value in blocks if value)
+    return text[:max_chars]
+
+def _normalize_url(url):
+    # Scheme and host are case-insensitive; path and query are not
+    parts = urlsplit(url.strip())
+    return urlunsplit(parts._replace(scheme=parts.scheme.lower(),
+                                     netloc=parts.netloc.lower())).rstrip("/")
+
+def cached_scrape(url, max_chars=MAX_CHARS):
+    """scrape_website, memoized so a re-audit with a new rubric/model skips the fetch."""
+    key = ("scrape", _normalize_url(url), max_chars)
+    text = CACHE.get(key)
+    if text is None:
+        text = scrape_website(url, max_chars=max_chars)
+        CACHE.set(key, text, expire=SCRAPE_TTL)
+    return text
+
+async def ascrape(url, aclient, sem, max_chars=MAX_CHARS):
+    """Async cached_scrape, fetching through a shared httpx.AsyncClient."""
+    key = ("scrape", _normalize_url(url), max_chars)
+    text = CACHE.get(key)
+    if text is None:
+        async with sem:
+            # Same retry budget as SESSION's Retry(total=3, backoff_factor=0.3)
+            for attempt in range(SCRAPE_RETRIES + 1):
+                try:
+                    resp = await aclient.get(url)
+                    break
+                except httpx.TransportError:
+                    if attempt == SCRAPE_RETRIES:
+                        raise
+                    await asyncio.sleep(0.3 * 2 ** attempt)
+        resp.raise_for_status()  # don't feed error pages to GPT
+        text = extract_text(resp.text, max_chars=max_chars)
+        CACHE.set(key, text, expire=SCRAPE_TTL)
+    return text
+
+async def _scrape_many(urls, max_chars=MAX_CHARS):
+    sem = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    async with httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=50),
+        headers={"User-Agent": SESSION.headers["User-Agent"]},
+        timeout=httpx.Timeout(10, connect=3),
+        follow_redirects=True
+    ) as aclient:
+        # A blocked or dead site comes back as its exception, not a failed run
+        return await asyncio.gather(
+            *[ascrape(u, aclient, sem, max_chars=max_chars) for u in urls],
+            return_exceptions=True
+        )
+
+def build_instructions(rubric):
+    # Static across users and calls; sent as `instructions` so it leads the cacheable prefix
     return (
-        f"Analyze the following website text for Brand, Content, Website, and Marketing:\n\n{text}\n\n"
-        f"Use this rubric: {json.dumps(rubric)}\n"
-        "Return STRICT JSON ONLY with keys: Brand, Content, Website, Marketing.\n"
-        "Each key must contain: grade (A+ to F), reasoning (string), quick_wins (list of strings)."
-        "Provide a thoroughly detailed paragraph and actionable recommendations in the quick wins section and examples for each section"
+        "You are a senior growth strategist auditing company websites.\n"
+        f"Use this rubric: {orjson.dumps(rubric).decode()}\n"
+        "For each section you are asked to grade, return grade (A+ to F), reasoning (string), quick_wins (list of strings)."
+        "Provide a thoroughly detailed paragraph and actionable recommendations in the quick wins section and examples"
     )
 
-def analyze(text, rubric, model="gpt-4o-mini"):
-    prompt = build_prompt(text, rubric)
-    resp = client.responses.create(
+def _instructions_for(rubric):
+    return SYSTEM_MSG if rubric is RUBRIC else build_instructions(rubric)
+
+def build_prompt(text, section):
+    # The scraped text comes before the section name so the prefix is shared
+    # by all four section calls
+    return f"Website content:\n\n{text}\n\nGrade only the {section} section."
+
+Grade = Literal["A+", "A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D+", "D", "F"]
+
+class Section(BaseModel):
+    """Schema the API is held to for each graded rubric section."""
+    grade: Grade
+    reasoning: str
+    quick_wins: list[str]
+
+class SiteAudit(BaseModel):
+    url: str
+    Brand: Section
+    Content: Section
+    Website: Section
+    Marketing: Section
+
+class BatchAudit(BaseModel):
+    results: list[SiteAudit]
+
+async def analyze_section(aclient, section, text, instructions, model="gpt-4o-mini", on_delta=None):
+    """
+    Grade a single rubric section; returns (section, parsed_json).
+    on_delta: optional callback(section, partial_text) fired as tokens stream in
+    """
+    prompt = build_prompt(text, section)
+    raw = ""
+    async with aclient.responses.stream(
         model=model,
+        instructions=instructions,
         input=prompt,
-        temperature=0.4
+        temperature=0.4,
+        text_format=Section
+    ) as stream:
+        async for event in stream:
+            if event.type == "response.output_text.delta":
+                raw += event.delta
+                if on_delta:
+                    on_delta(section, raw)
+        try:
+            final = await stream.get_final_response()
+            parsed = final.output_parsed
+        except Exception:
+            parsed = None
+
+    if parsed is None:
+        # Refusal or truncated output; the schema is otherwise guaranteed
+        return section, {"error": "Could not parse JSON", "raw": raw}
+    return section, parsed.model_dump()
+
+async def _analyze_all(text, rubric, model, on_delta=None):
+    # One client per audit: the httpx pool is bound to the running event loop,
+    # so it can't outlive the asyncio.run() call that created it
+    http_client = httpx.AsyncClient(limits=httpx.Limits(max_connections=MAX_CONNECTIONS))
+    instructions = _instructions_for(rubric)
+    async with AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client) as aclient:
+        return await asyncio.gather(
+            *[analyze_section(aclient, k, text, instructions, model=model, on_delta=on_delta)
+              for k in rubric]
+        )
+
+def analyze(text, rubric, model="gpt-4o-mini", on_delta=None):
+    """Grade every rubric section concurrently and assemble the audit dict."""
+    results = asyncio.run(_analyze_all(text, rubric, model, on_delta=on_delta))
+    return dict(results)
+
+def build_batch_prompt(sites):
+    """sites: list of (url, text) tuples, audited together in one request."""
+    blocks = "".join(f"### SITE {i} ({url}):\n{text}\n\n" for i, (url, text) in enumerate(sites, 1))
+    return (
+        f"{blocks}Grade every rubric section for each site above. "
+        "Return one entry in results per site, in the same order, with its url."
     )
-    raw = resp.output_text
 
-    # Extract JSON object from raw text
+async def analyze_batch(aclient, sites, rubric, model="gpt-4o-mini", instructions=None):
+    """Grade several sites with one request; returns [(url, audit_dict), ...]."""
+    failure = "Could not parse JSON"
     try:
-        json_match = re.search(r"(\{.*\})", raw, re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group(1))
-        else:
-            return {"error": "Could not parse JSON", "raw": raw}
-    except Exception:
-        return {"error": "Could not parse JSON", "raw": raw}
+        resp = await aclient.responses.parse(
+            model=model,
+            instructions=instructions or _instructions_for(rubric),
+            input=build_batch_prompt(sites),
+            temperature=0.4,
+            text_format=BatchAudit
+        )
+        results = resp.output_parsed.results if resp.output_parsed else []
+    except Exception as e:
+        results, failure = [], str(e)
+
+    return _match_results(sites, results, rubric, failure)
+
+def _match_results(sites, results, rubric, failure="Could not parse JSON"):
+    by_url = {r.url: r for r in results}
+    matched = [by_url.get(url) for url, _ in sites]
+    # The model may rewrite a url; fall back to position only when the counts
+    # line up, and never hand a result already matched by url to another site
+    if len(results) == len(sites):
+        used = {id(r) for r in matched if r is not None}
+        for i, r in enumerate(matched):
+            if r is None and id(results[i]) not in used:
+                matched[i] = results[i]
+                used.add(id(results[i]))
+    return [
+        (url, r.model_dump(exclude={"url"}) if r is not None else _error_audit(failure, rubric))
+        for (url, _), r in zip(sites, matched)
+    ]
+
+def _error_audit(message, rubric):
+    return {k: {"error": message} for k in rubric}
+
+async def _analyze_batches(batches, rubric, model):
+    http_client = httpx.AsyncClient(limits=httpx.Limits(max_connections=MAX_CONNECTIONS))
+    async with AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client) as aclient:
+        instructions = _instructions_for(rubric)
+        results = await asyncio.gather(
+            *[analyze_batch(aclient, b, rubric, model=model, instructions=instructions) for b in batches]
+        )
+    return [pair for batch in results for pair in batch]
+
+_SAFE_TABLE = str.maketrans({"–": "-", "“": '"', "”": '"'})
 
 def safe_text(text):
-    return str(text).replace("–", "-").replace("“", '"').replace("”", '"')
+    return str(text).translate(_SAFE_TABLE)
 
 def wrap_text(text, width=90):
     return "\n".join(textwrap.wrap(text, width=width))
@@ -73,29 +313,48 @@ import textwrap
 from fpdf import FPDF
 import os
 
+_SANITIZE_RE = re.compile(r'[^\w\-_. ]')
+
 def sanitize_filename(name: str) -> str:
     """Sanitize website name to use as a valid filename."""
-    return re.sub(r'[^\w\-_. ]', '_', name)
+    return _SANITIZE_RE.sub('_', name)
+
+_DEFAULT_HEADER = "Growth_Marketing_Audit_Header.png"
+_DEFAULT_HEADING_FONT = "Montserrat-ExtraBold.ttf"
+_DEFAULT_BODY_FONT = "Montserrat-Medium.ttf"
+_DEFAULT_ICONS = {
+    "Brand": "brand-icon.png",
+    "Content": "content-icon.png",
+    "Website": "build-icon.png",
+    "Marketing": "grow-icon.png"
+}
+
+_ASSET_BYTES = {}
 
-def build_pdf(audit, website_url, header_image="Growth_Marketing_Audit_Header.png",
-              heading_font="Montserrat-ExtraBold.ttf", body_font="Montserrat-Medium.ttf",
+def _asset_bytes(path):
+    """Image file contents, read once per process; None if the file is missing."""
+    if path not in _ASSET_BYTES:
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                _ASSET_BYTES[path] = f.read()
+        else:
+            _ASSET_BYTES[path] = None
+    return _ASSET_BYTES[path]
+
+def build_pdf(audit, out: BinaryIO | None = None, header_image=_DEFAULT_HEADER,
+              heading_font=_DEFAULT_HEADING_FONT, body_font=_DEFAULT_BODY_FONT,
               icon_paths=None):
     """
     Build a branded PDF audit report.
     audit: dict returned from generate_audit_report
-    website_url: used to name the output file
-    header_image: path to top header image
+    out: binary file handle to write to; if None, the PDF bytes are returned
+    header_image: path to top header image, or its bytes
     heading_font: path to heading font TTF
     body_font: path to body font TTF
     icon_paths: dict mapping section name to icon filename
     """
     if icon_paths is None:
-        icon_paths = {
-            "Brand": "brand-icon.png",
-            "Content": "content-icon.png",
-            "Website": "build-icon.png",
-            "Marketing": "grow-icon.png"
-        }
+        icon_paths = _DEFAULT_ICONS
 
     # Updated color map for grades
     grade_colors = {
@@ -113,29 +372,71 @@ def build_pdf(audit, website_url, header_image="Growth_Marketing_Audit_Header.pn
         "F": (229, 31, 31)
     }
 
+    # Resolve font/icon files once rather than stat-ing them per section
+    have_heading = bool(heading_font) and os.path.exists(heading_font)
+    have_body = bool(body_font) and os.path.exists(body_font)
+    icon_data = {k: data for k, v in icon_paths.items() if (data := _asset_bytes(v))}
+
     pdf = FPDF()
     pdf.add_page()
-    pdf.set_auto_page_break(auto=True, margin=15)
+    # Page breaks are placed explicitly below from pre-measured block heights
+    pdf.set_auto_page_break(auto=False, margin=15)
 
     # Background color
     pdf.set_fill_color(249, 249, 250)
     pdf.rect(0, 0, 210, 297, 'F')  # full page
 
-    # Register fonts
-    if heading_font and os.path.exists(heading_font):
-        pdf.add_font("HeadingFont", "", heading_font, uni=True)
-    if body_font and os.path.exists(body_font):
-        pdf.add_font("BodyFont", "", body_font, uni=True)
+    # Register fonts per document: fpdf2 subsets the parsed TTF in place on
+    # output(), so a font object can't be shared between documents
+    if have_heading:
+        pdf.add_font("HeadingFont", "", heading_font)
+    if have_body:
+        pdf.add_font("BodyFont", "", body_font)
+    heading_face = ("HeadingFont", "") if have_heading else ("Helvetica", "B")
+    body_face = ("BodyFont", "") if have_body else ("Helvetica", "")
 
-    # Add header image
-    if header_image and os.path.exists(header_image):
-        pdf.image(header_image, x=0, y=0, w=210)  # full width
+    # Add header image (a path, or PNG bytes preloaded by the caller)
+    header_data = header_image if isinstance(header_image, bytes) else _asset_bytes(header_image)
+    if header_data:
+        pdf.image(io.BytesIO(header_data), x=0, y=0, w=210)  # full width
 
     pdf.ln(40)  # space after header image
 
+    # Only touch the font/color state when it actually changes
+    current_font = None
+    def use_font(family, style, size):
+        nonlocal current_font
+        if current_font != (family, style, size):
+            pdf.set_font(family, style, size)
+            current_font = (family, style, size)
+
     # Sections
     section_x = 20
     text_width = 170  # page width minus margins
+    text_color = (28, 28, 28)
+    pdf.set_text_color(*text_color)
+    line_h = 6
+    page_bottom = pdf.h - pdf.b_margin
+    max_block = page_bottom - pdf.t_margin
+
+    def measure(text):
+        return pdf.multi_cell(text_width, line_h, text, dry_run=True, output=MethodReturnValue.HEIGHT)
+
+    def ensure_space(h):
+        if pdf.get_y() + h > page_bottom:
+            pdf.add_page()
+
+    def write_block(text, h, room=max_block):
+        # room: the most a page can hold once whatever is kept with this block
+        # (title row, label) sits above it
+        pdf.set_x(section_x)
+        if h > room:
+            # Won't fit below its heading on any page; let fpdf2 split it
+            pdf.set_auto_page_break(auto=True, margin=pdf.b_margin)
+            pdf.multi_cell(text_width, line_h, text)
+            pdf.set_auto_page_break(auto=False, margin=pdf.b_margin)
+        else:
+            pdf.multi_cell(text_width, line_h, text)
 
     for section, details in audit.items():
         if isinstance(details, dict):
@@ -147,106 +448,294 @@ def build_pdf(audit, website_url, header_image="Growth_Marketing_Audit_Header.pn
             reasoning = str(details)
             quick_wins = []
 
+        # Keep the title row (8 + 6 gap) on the same page as the reasoning
+        use_font(*body_face, 11)
+        reasoning_clean = " ".join(reasoning.splitlines())
+        reasoning_h = measure(reasoning_clean)
+        reasoning_room = max_block - 14
+        ensure_space(14 + min(reasoning_h, reasoning_room))
+
         # Section icon
-        icon_file = icon_paths.get(section)
+        icon_file = icon_data.get(section)
         icon_width = 8
         icon_gap = 4
         y_start = pdf.get_y()
-        if icon_file and os.path.exists(icon_file):
-            pdf.image(icon_file, x=section_x, y=y_start, w=icon_width)
+        if icon_file:
+            pdf.image(io.BytesIO(icon_file), x=section_x, y=y_start, w=icon_width)
         title_x = section_x + (icon_width + icon_gap if icon_file else 0)
 
         # Section title
-        if heading_font and os.path.exists(heading_font):
-            pdf.set_font("HeadingFont", "", 16)
-        else:
-            pdf.set_font("Helvetica", "B", 16)
-        pdf.set_text_color(28, 28, 28)
+        use_font(*heading_face, 16)
         pdf.set_xy(title_x, y_start)
         pdf.cell(0, 8, f"{section} - ", ln=False)
 
         # Letter grade (colored) aligned to right margin
-        pdf.set_text_color(*grade_colors.get(grade, (28, 28, 28)))
+        pdf.set_text_color(*grade_colors.get(grade, text_color))
         pdf.set_xy(section_x + text_width - 15, y_start)  # right-align grade
         pdf.cell(15, 8, grade, ln=True, align="R")
+        pdf.set_text_color(*text_color)
 
         pdf.ln(6)  # extra space between title and reasoning
 
         # Reasoning - make cohesive by removing existing line breaks
-        if body_font and os.path.exists(body_font):
-            pdf.set_font("BodyFont", "", 11)
-        else:
-            pdf.set_font("Helvetica", "", 11)
-        pdf.set_text_color(28, 28, 28)
-        reasoning_clean = " ".join(reasoning.splitlines())
-        pdf.set_x(section_x)
-        pdf.multi_cell(text_width, 6, reasoning_clean)
+        use_font(*body_face, 11)
+        write_block(reasoning_clean, reasoning_h, reasoning_room)
         pdf.ln(3)
 
         # Quick wins
         if quick_wins:
-            if heading_font and os.path.exists(heading_font):
-                pdf.set_font("HeadingFont", "", 13)
-            else:
-                pdf.set_font("Helvetica", "B", 13)
-            pdf.set_text_color(28, 28, 28)
+            # multi_cell wraps to text_width itself; no textwrap pre-pass
+            bullets = [f"- {q}" for q in quick_wins]
+            use_font(*body_face, 10)
+            heights = [measure(b) for b in bullets]
+            first_room = max_block - line_h
+            ensure_space(line_h + min(heights[0], first_room))  # label + first bullet
+            use_font(*heading_face, 13)
             pdf.set_x(section_x)
-            pdf.cell(0, 6, "Quick Wins:", ln=True)
-            pdf.set_font("BodyFont" if body_font and os.path.exists(body_font) else "Helvetica", "", 10)
-            pdf.set_text_color(28, 28, 28)
-            for q in quick_wins:
-                q_wrapped = textwrap.fill(f"- {q}", width=110)
-                pdf.set_x(section_x)  # reset x for each bullet line
-                pdf.multi_cell(text_width, 6, q_wrapped)
+            pdf.cell(0, line_h, "Quick Wins:", ln=True)
+            use_font(*body_face, 10)
+            for i, (bullet, h) in enumerate(zip(bullets, heights)):
+                room = first_room if i == 0 else max_block
+                ensure_space(min(h, room))
+                write_block(bullet, h, room)
             pdf.ln(6)
 
-    # Output file name based on website
-    sanitized_name = sanitize_filename(website_url)
-    out_file = f"audit_{sanitized_name}.pdf"
-    pdf.output(out_file)
-    return out_file
+    if out is None:
+        return bytes(pdf.output())
+    pdf.output(out)
+    return out
+
+# Read the default images at import so the first audit doesn't pay for it
+for _path in [_DEFAULT_HEADER, *_DEFAULT_ICONS.values()]:
+    _asset_bytes(_path)
 
 
 # ==========================
 # STREAMLIT ENTRYPOINT
 # ==========================
-def generate_audit_report(website_url: str, model="gpt-4o-mini"):
+RUBRIC = {
+    "Brand": "Is the brand positioning clear and differentiated? If not, what’s confusing or weak? Where does the messaging fail to connect with the intended audience? Critique tone, clarity, and trust signals. Provide sharper alternatives.",
+    "Content": "Point out missing or poorly optimized elements: meta tags, keyword targeting, content depth. Identify weaknesses compared to industry best practices (e.g., lack of authority content, weak internal linking). Suggest exactly what types of content should be created or improved",
+    "Website": "Critically evaluate navigation, mobile performance, and calls-to-action. Identify friction points that would cause a visitor to bounce or fail to convert. Be blunt about design flaws, clutter, or poor layout choices. Recommend fixes.",
+    "Marketing": "- Call out channels the business is underutilizing (paid ads, email nurture, partnerships, retargeting). Highlight quick wins that could drive immediate ROI. Provide bold, high-impact recommendations for scaling growth — even if they require major changes.  "
+}
+
+SYSTEM_MSG = build_instructions(RUBRIC)
+
+def generate_audit_report(website_url: str, model="gpt-4o-mini", on_delta=None, max_chars=MAX_CHARS):
     """You are a senior digital marketing strategist conducting a critical growth marketing audit. 
     Do not sugarcoat or give generic advice — be direct, constructive, and specific. 
     Highlight what is NOT working, what is missing, and where {business_name} is likely losing opportunities. For each category, include: Strengths (specific examples from the website) Weaknesses or risks (be critical, call out what doesn’t work) 3–5 detailed recommendations (actionable, prioritized)
 """
-    text = scrape_website(website_url)
-    rubric = {
-        "Brand": "Is the brand positioning clear and differentiated? If not, what’s confusing or weak? Where does the messaging fail to connect with the intended audience? Critique tone, clarity, and trust signals. Provide sharper alternatives.",
-        "Content": "Point out missing or poorly optimized elements: meta tags, keyword targeting, content depth. Identify weaknesses compared to industry best practices (e.g., lack of authority content, weak internal linking). Suggest exactly what types of content should be created or improved",
-        "Website": "Critically evaluate navigation, mobile performance, and calls-to-action. Identify friction points that would cause a visitor to bounce or fail to convert. Be blunt about design flaws, clutter, or poor layout choices. Recommend fixes.",
-        "Marketing": "- Call out channels the business is underutilizing (paid ads, email nurture, partnerships, retargeting). Highlight quick wins that could drive immediate ROI. Provide bold, high-impact recommendations for scaling growth — even if they require major changes.  "
-    }
-    audit = analyze(text, rubric, model=model)
+    text = cached_scrape(website_url, max_chars=max_chars)
+    key = _audit_key(website_url, text, model, "section")
+    audit = CACHE.get(key)
+    if audit is not None:
+        return audit
+
+    audit = analyze(text, RUBRIC, model=model, on_delta=on_delta)
+    _store_audit(key, audit)
     return audit
 
+def _audit_key(website_url, text, model, mode):
+    # mode names the prompt layout ("section" per-section calls, "batch" for
+    # build_batch_prompt); with SYSTEM_MSG it makes a prompt change a cache miss
+    rubric_json = orjson.dumps(RUBRIC, option=orjson.OPT_SORT_KEYS).decode()
+    return hashlib.blake2b(
+        f"{mode}|{model}|{SYSTEM_MSG}|{rubric_json}|{_normalize_url(website_url)}|{text}".encode()
+    ).hexdigest()
+
+def _store_audit(key, audit):
+    # Don't pin a failed section for a week; let the next run retry it
+    if not any(isinstance(d, dict) and "error" in d for d in audit.values()):
+        CACHE.set(key, audit, expire=AUDIT_TTL)
+
+def _partition_cached(urls, texts, model):
+    # Split into cached/failed audits and (url, text, key) still to be graded
+    audits, pending = {}, []
+    for url, text in zip(urls, texts):
+        if isinstance(text, Exception):
+            audits[url] = _error_audit(f"Could not scrape {url}: {text}", RUBRIC)
+            continue
+        key = _audit_key(url, text, model, "batch")
+        cached = CACHE.get(key)
+        if cached is not None:
+            audits[url] = cached
+        else:
+            pending.append((url, text, key))
+    return audits, pending
+
+async def _audit_many(urls, model, max_chars):
+    texts = await _scrape_many(urls, max_chars=max_chars)
+    audits, pending = _partition_cached(urls, texts, model)
+    if pending:
+        batches = [[(url, text) for url, text, _ in pending[i:i + BATCH_SIZE]]
+                   for i in range(0, len(pending), BATCH_SIZE)]
+        results = dict(await _analyze_batches(batches, RUBRIC, model))
+        for url, _, key in pending:
+            audits[url] = results[url]
+            _store_audit(key, results[url])
+    return audits
+
+def audit_many(urls, model="gpt-4o-mini", max_chars=MAX_CHARS):
+    """
+    Audit several sites: scrape them concurrently, then pack up to BATCH_SIZE
+    into each request and run the requests concurrently. Returns {url: audit_dict}.
+    """
+    urls = list(dict.fromkeys(urls))
+    audits = asyncio.run(_audit_many(urls, model, max_chars))
+    return {url: audits[url] for url in urls}
+
+def _output_text(body):
+    # Concatenate output_text parts of a raw /v1/responses body
+    return "".join(
+        part.get("text", "")
+        for item in body.get("output", []) if item.get("type") == "message"
+        for part in item.get("content", []) if part.get("type") == "output_text"
+    )
+
+def audit_batch_api(urls, model="gpt-4o-mini", max_chars=MAX_CHARS):
+    """
+    Audit sites through the OpenAI Batch API (half price, separate rate limits)
+    and block until the job finishes. Returns {url: audit_dict}.
+    """
+    urls = list(dict.fromkeys(urls))
+    texts = asyncio.run(_scrape_many(urls, max_chars=max_chars))
+    audits, pending = _partition_cached(urls, texts, model)
+
+    if pending:
+        text_format = {"format": {"type": "json_schema", "name": "batch_audit",
+                                  "schema": BatchAudit.model_json_schema(), "strict": False}}
+        lines = [
+            orjson.dumps({
+                "custom_id": f"site-{i}",
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": {"model": model, "instructions": SYSTEM_MSG,
+                         "input": build_batch_prompt([(url, text)]),
+                         "temperature": 0.4, "text": text_format},
+            })
+            for i, (url, text, _) in enumerate(pending)
+        ]
+        batch_file = client.files.create(file=("audits.jsonl", b"\n".join(lines)), purpose="batch")
+        batch = client.batches.create(input_file_id=batch_file.id, endpoint="/v1/responses",
+                                      completion_window="24h")
+        print(f"Submitted batch {batch.id} ({len(pending)} sites)...")
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(BATCH_POLL_SECONDS)
+            batch = client.batches.retrieve(batch.id)
+            print(f"Batch {batch.id}: {batch.status}")
+
+        outputs = {}
+        if batch.output_file_id:
+            for line in client.files.content(batch.output_file_id).text.splitlines():
+                row = orjson.loads(line)
+                body = (row.get("response") or {}).get("body") or {}
+                outputs[row["custom_id"]] = _output_text(body)
+
+        for i, (url, text, key) in enumerate(pending):
+            raw = outputs.get(f"site-{i}")
+            failure = "Could not parse JSON" if raw else f"Batch {batch.id} returned no output ({batch.status})"
+            try:
+                results = BatchAudit.model_validate_json(raw).results if raw else []
+            except Exception:
+                results = []
+            [(_, audit)] = _match_results([(url, text)], results, RUBRIC, failure)
+            audits[url] = audit
+            _store_audit(key, audit)
+
+    return {url: audits[url] for url in urls}
+
 # ==========================
 # CLI ENTRYPOINT
 # ==========================
+def _build_pdf_file(job):
+    # Top-level so ProcessPoolExecutor can pickle it. Renders fully before
+    # touching disk so a failed render never leaves a truncated PDF behind;
+    # failures come back as strings so one bad site doesn't sink the rest
+    audit, out_file, pdf_kwargs = job
+    try:
+        data = build_pdf(audit, **pdf_kwargs)
+        with open(out_file, "wb") as f:
+            f.write(data)
+    except Exception as e:
+        return out_file, f"{type(e).__name__}: {e}"
+    return out_file, None
+
+def write_pdfs(audits, pdf_kwargs):
+    """
+    Render one PDF per audited site in parallel processes.
+    Returns (written file names, {file name: error} for renders that failed).
+    """
+    header = pdf_kwargs.get("header_image")
+    if isinstance(header, str) and _asset_bytes(header):
+        # Read once here rather than once per worker job
+        pdf_kwargs = {**pdf_kwargs, "header_image": _asset_bytes(header)}
+
+    # Output file name based on website
+    jobs = [(audit, f"audit_{sanitize_filename(url)}.pdf", pdf_kwargs) for url, audit in audits.items()]
+    if len(jobs) <= 1:
+        outcomes = [_build_pdf_file(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as ex:
+            outcomes = list(ex.map(_build_pdf_file, jobs))
+
+    written = [out_file for out_file, error in outcomes if error is None]
+    failed = {out_file: error for out_file, error in outcomes if error is not None}
+    return written, failed
+
+def _pdf_kwargs(args):
+    # Unset flags fall back to the bundled assets; passing None would drop to
+    # core Helvetica, which can't encode the model's curly quotes and dashes
+    return dict(
+        header_image=args.logo or _DEFAULT_HEADER,
+        heading_font=args.heading_font or _DEFAULT_HEADING_FONT,
+        body_font=args.body_font or _DEFAULT_BODY_FONT
+    )
+
 def main():
     parser = argparse.ArgumentParser(description="Growth Marketing Audit")
-    parser.add_argument("--url", required=True, help="Website URL to audit")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--url", help="Website URL to audit")
+    source.add_argument("--url-list", help="File with one website URL per line; one PDF per site")
     parser.add_argument("--out", default="audit.pdf", help="Output PDF file")
     parser.add_argument("--logo", help="Path to logo image")
     parser.add_argument("--heading-font", help="Path to Soleil Extra Bold .ttf")
     parser.add_argument("--body-font", help="Path to Montserrat Medium .ttf")
     parser.add_argument("--model", default="gpt-4o-mini", help="OpenAI model")
+    parser.add_argument("--max-chars", type=int, default=MAX_CHARS, help="Limit scraped text sent to the model")
+    parser.add_argument("--batch", action="store_true",
+                        help="With --url-list, submit through the OpenAI Batch API (cheaper, not interactive)")
     args = parser.parse_args()
+    if args.batch and not args.url_list:
+        parser.error("--batch requires --url-list")
+
+    pdf_kwargs = _pdf_kwargs(args)
 
-    audit = generate_audit_report(args.url, model=args.model)
+    if args.url_list:
+        with open(args.url_list) as f:
+            urls = [line.strip() for line in f if line.strip()]
+        run = audit_batch_api if args.batch else audit_many
+        audits = run(urls, model=args.model, max_chars=args.max_chars)
+        for url, audit in list(audits.items()):
+            if all(isinstance(d, dict) and "error" in d for d in audit.values()):
+                print(f"Skipping {url}: {next(iter(audit.values()))['error']}", file=sys.stderr)
+                del audits[url]
+        print("Generating PDFs...")
+        written, failed = write_pdfs(audits, pdf_kwargs)
+        for out_file in written:
+            print(out_file)
+        for out_file, error in failed.items():
+            print(f"Failed to render {out_file}: {error}", file=sys.stderr)
+        if failed:
+            sys.exit(1)
+        return
+
+    audit = generate_audit_report(args.url, model=args.model, max_chars=args.max_chars)
     print("Generating PDF...")
-    build_pdf(
-        audit,
-        args.out,
-        logo_path=args.logo,
-        heading_font=args.heading_font,
-        body_font=args.body_font
-    )
+    data = build_pdf(audit, **pdf_kwargs)  # render before opening --out
+    with open(args.out, "wb") as f:
+        f.write(data)
 
 if __name__ == "__main__":
     main()
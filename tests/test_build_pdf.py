@@ -0,0 +1,92 @@
+import argparse
+import os
+from pathlib import Path
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import audit_mvp  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _audit(text):
+    return {"Brand": {"grade": "A", "reasoning": text, "quick_wins": [text]}}
+
+
+def test_build_pdf_twice_with_different_glyphs():
+    # Fonts must not be shared between documents: the first output() subsets
+    # them, and the second document here uses glyphs the first one didn't
+    fonts = dict(heading_font=str(ROOT / "Montserrat-ExtraBold.ttf"),
+                 body_font=str(ROOT / "Montserrat-Medium.ttf"))
+    first = audit_mvp.build_pdf(_audit("hello world"), **fonts)
+    second = audit_mvp.build_pdf(_audit("zzz qqq"), **fonts)
+    assert first.startswith(b"%PDF")
+    assert second.startswith(b"%PDF")
+
+
+def test_write_pdfs_collects_failures_without_partial_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pdf_kwargs = dict(header_image=str(ROOT / "Growth_Marketing_Audit_Header.png"),
+                      heading_font=str(ROOT / "Montserrat-ExtraBold.ttf"),
+                      body_font=str(ROOT / "Montserrat-Medium.ttf"))
+    audits = {
+        "https://a.com": _audit("hello world"),
+        "https://b.com": {"Brand": {"grade": "B", "reasoning": None}},  # fails to render
+        "https://c.com": _audit("zzz qqq"),
+        "https://d.com": _audit("jumpy vex"),
+    }
+    written, failed = audit_mvp.write_pdfs(audits, pdf_kwargs)
+    assert written == ["audit_https___a.com.pdf", "audit_https___c.com.pdf", "audit_https___d.com.pdf"]
+    assert list(failed) == ["audit_https___b.com.pdf"]
+    assert not (tmp_path / "audit_https___b.com.pdf").exists()
+    for name in written:
+        assert (tmp_path / name).read_bytes().startswith(b"%PDF")
+
+
+def test_cli_pdf_kwargs_default_to_bundled_fonts(monkeypatch):
+    # The bundled paths are relative, as when the CLI runs from the repo root
+    monkeypatch.chdir(ROOT)
+    args = argparse.Namespace(logo=None, heading_font=None, body_font=None)
+    pdf_kwargs = audit_mvp._pdf_kwargs(args)
+    assert pdf_kwargs["heading_font"] == "Montserrat-ExtraBold.ttf"
+    assert pdf_kwargs["body_font"] == "Montserrat-Medium.ttf"
+    # Core Helvetica can't encode these; the TTFs can
+    audit = _audit("The brand doesn’t land — “generic” copy")
+    assert audit_mvp.build_pdf(audit, **pdf_kwargs).startswith(b"%PDF")
+
+
+def test_reasoning_just_under_a_page_stays_inside_the_margin(monkeypatch):
+    body_font = str(ROOT / "Montserrat-Medium.ttf")
+    lines = []
+
+    class RecordingFPDF(audit_mvp.FPDF):
+        depth = 0
+
+        def multi_cell(self, *args, **kwargs):
+            # A dry run re-enters multi_cell; only record outermost writes
+            self.depth += 1
+            try:
+                result = super().multi_cell(*args, **kwargs)
+            finally:
+                self.depth -= 1
+            if not self.depth and not kwargs.get("dry_run"):
+                lines.append((self.page, self.get_y(), self.h - self.b_margin))
+            return result
+
+    # Fits on an empty page by itself, but not below the 14mm title row
+    probe = audit_mvp.FPDF()
+    probe.add_page()
+    probe.set_auto_page_break(auto=False, margin=15)
+    probe.add_font("BodyFont", "", body_font)
+    probe.set_font("BodyFont", "", 11)
+    max_block = probe.h - probe.b_margin - probe.t_margin
+    text = "word"
+    while probe.multi_cell(170, 6, text, dry_run=True,
+                           output=audit_mvp.MethodReturnValue.HEIGHT) <= max_block - 14:
+        text += " word" * 5
+
+    monkeypatch.setattr(audit_mvp, "FPDF", RecordingFPDF)
+    audit_mvp.build_pdf({"Brand": {"grade": "A", "reasoning": text, "quick_wins": []}},
+                        heading_font=str(ROOT / "Montserrat-ExtraBold.ttf"), body_font=body_font)
+    assert lines
+    assert all(y <= bottom + 0.01 for _, y, bottom in lines)
@@ -0,0 +1,34 @@
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import audit_mvp  # noqa: E402
+
+SITES = [("https://a.com", "text a"), ("https://b.com", "text b")]
+
+
+def _site(url, grade):
+    section = {"grade": grade, "reasoning": url, "quick_wins": []}
+    return audit_mvp.SiteAudit(url=url, **dict.fromkeys(audit_mvp.RUBRIC, section))
+
+
+def test_rewritten_url_falls_back_to_its_position():
+    results = [_site("a.com", "A"), _site("https://b.com", "B")]
+    matched = dict(audit_mvp._match_results(SITES, results, audit_mvp.RUBRIC))
+    assert matched["https://a.com"]["Brand"]["grade"] == "A"
+    assert matched["https://b.com"]["Brand"]["grade"] == "B"
+
+
+def test_rewritten_url_never_takes_another_sites_result():
+    # a's result comes back second with a rewritten url; slot 0 holds b's
+    results = [_site("https://b.com", "B"), _site("https://a.com/", "A")]
+    matched = dict(audit_mvp._match_results(SITES, results, audit_mvp.RUBRIC))
+    assert matched["https://b.com"]["Brand"]["grade"] == "B"
+    assert matched["https://a.com"] == audit_mvp._error_audit("Could not parse JSON", audit_mvp.RUBRIC)
+
+
+def test_missing_result_is_an_error_audit():
+    results = [_site("https://b.com", "B")]
+    matched = dict(audit_mvp._match_results(SITES, results, audit_mvp.RUBRIC))
+    assert matched["https://b.com"]["Brand"]["grade"] == "B"
+    assert all("error" in d for d in matched["https://a.com"].values())
@@ -0,0 +1,36 @@
+import asyncio
+import functools
+import os
+
+import diskcache
+import httpx
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import audit_mvp  # noqa: E402
+
+PAGE = "<html><head><title>Acme</title></head><body><main><p>We sell anvils.</p></main></body></html>"
+
+
+def test_scrape_many_returns_blocked_site_as_its_exception(tmp_path, monkeypatch):
+    def handler(request):
+        if request.url.host == "blocked.com":
+            return httpx.Response(403, text="Forbidden")
+        return httpx.Response(200, text=PAGE)
+
+    monkeypatch.setattr(audit_mvp, "CACHE", diskcache.Cache(str(tmp_path)))
+    monkeypatch.setattr(audit_mvp.httpx, "AsyncClient",
+                        functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handler)))
+
+    urls = ["https://a.com", "https://blocked.com", "https://c.com"]
+    texts = asyncio.run(audit_mvp._scrape_many(urls))
+
+    assert texts[0] == texts[2] == "TITLE: Acme\nBODY: We sell anvils."
+    assert isinstance(texts[1], httpx.HTTPStatusError)
+    assert texts[1].response.status_code == 403
+    # The failure isn't cached, so the next run fetches the site again
+    assert audit_mvp.CACHE.get(("scrape", "https://blocked.com", audit_mvp.MAX_CHARS)) is None
+
+    audits, pending = audit_mvp._partition_cached(urls, texts, "gpt-4o-mini")
+    assert [url for url, _, _ in pending] == ["https://a.com", "https://c.com"]
+    assert all("error" in d for d in audits["https://blocked.com"].values())